@@ -8,7 +8,8 @@ du projet et prendre les captures d'écran correspondantes.
 
 CONCEPT:
 - Chaque capture d'écran correspond à un commit Git spécifique
-- Le script checkout le commit, prend la capture, puis passe au suivant
+- Le script prépare un worktree Git par commit (le projet lui-même n'est
+  jamais modifié), prend la capture, puis passe au suivant
 - Les commits sont tagués avec le nom de la capture (ex: [screenshot:home-styled])
 
 WORKFLOW RECOMMANDÉ:
@@ -26,16 +27,29 @@ import os
 import sys
 import re
 import yaml
+import asyncio
+import concurrent.futures
+import fnmatch
+import functools
+import io
+import itertools
+import json
 import subprocess
 import time
 import shutil
+import socket
+import tarfile
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Set, Tuple
 from datetime import datetime
 
 try:
-    from playwright.sync_api import sync_playwright
+    from playwright.async_api import async_playwright
 
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
@@ -72,17 +86,30 @@ class ScreenshotSpec:
     output_path: str = ""
     viewport_width: int = 1280
     viewport_height: int = 800
+    device_scale_factor: float = 1.0  # 2.0 pour une capture "retina"
     full_page: bool = False
     wait_for: Optional[str] = None
+    wait_until: str = "load"  # "load", "domcontentloaded" ou "networkidle"
     delay: float = 1.0
     is_error_page: bool = False
     description: str = ""
     show_title_bar: bool = False  # Afficher une barre de titre style navigateur
     title_bar_style: str = "chrome"  # Style: "chrome", "safari", "minimal"
+    # Types de ressources non chargés (sans effet sur la plupart des captures)
+    blocked_resources: List[str] = field(default_factory=lambda: ["media", "font"])
+    block_third_party: bool = True  # Bloquer les requêtes vers d'autres origines
+    format: str = "png"  # Format: "png" ou "jpeg"
+    compression: int = 1  # Niveau zlib (0-9) du PNG ré-encodé par Pillow
+    quality: int = 90  # Qualité JPEG (1-100)
 
     def __post_init__(self):
         if not self.output_path:
-            self.output_path = f"screenshots/{self.name}.png"
+            self.output_path = f"screenshots/{self.name}{self.extension}"
+
+    @property
+    def extension(self) -> str:
+        """Extension de fichier correspondant au format"""
+        return ".jpg" if self.format == "jpeg" else ".png"
 
 
 @dataclass
@@ -134,82 +161,102 @@ class TitleBarRenderer:
         },
     }
 
+    # Polices système essayées dans l'ordre
+    FONT_PATHS = [
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+        "/System/Library/Fonts/Helvetica.ttc",
+        "C:\\Windows\\Fonts\\segoeui.ttf",
+    ]
+
     def __init__(self):
         if not PIL_AVAILABLE:
             raise RuntimeError("Pillow est requis pour les barres de titre")
+        # Résolu une seule fois, pas à chaque capture
+        self._font_path = next(
+            (path for path in self.FONT_PATHS if os.path.exists(path)), None
+        )
+        self._style_cache: Dict[str, dict] = {}
+        self._bar_template_cache: Dict[Tuple[str, int], "Image.Image"] = {}
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _load_fonts(font_path: Optional[str]) -> tuple:
+        """Charge les polices (titre, URL), ou la police par défaut"""
+        if font_path:
+            try:
+                return (
+                    ImageFont.truetype(font_path, 14),
+                    ImageFont.truetype(font_path, 12),
+                )
+            except OSError:
+                pass
+        default_font = ImageFont.load_default()
+        return default_font, default_font
+
+    def _get_style(self, style: str) -> dict:
+        """Retourne la config d'un style, avec polices et géométrie précalculées"""
+        if style in self._style_cache:
+            return self._style_cache[style]
+
+        style_config = dict(self.STYLES.get(style, self.STYLES["chrome"]))
+        style_config["title_font"], style_config["url_font"] = self._load_fonts(
+            self._font_path
+        )
+
+        # Boutons de fenêtre (rouge, jaune, vert)
+        button_y = 14
+        button_x = 16
+        button_radius = 6
+        button_spacing = 20
+        style_config["button_boxes"] = []
+        for i, color in enumerate(style_config["button_colors"]):
+            x = button_x + i * button_spacing
+            box = [
+                x - button_radius,
+                button_y - button_radius,
+                x + button_radius,
+                button_y + button_radius,
+            ]
+            style_config["button_boxes"].append((box, color))
+
+        # Barre d'URL (seule sa largeur dépend de l'image)
+        style_config["url_bar_y"] = 34
+        style_config["url_bar_margin"] = 80
+        style_config["url_bar_radius"] = style_config["url_bar_height"] // 2
+
+        self._style_cache[style] = style_config
+        return style_config
 
     def add_title_bar(
-        self, image_path: str, title: str, url: str, style: str = "chrome"
-    ) -> str:
+        self, original: "Image.Image", title: str, url: str, style: str = "chrome"
+    ) -> "Image.Image":
         """
-        Ajoute une barre de titre à une image existante.
+        Ajoute une barre de titre à une image, en mémoire.
 
         Args:
-            image_path: Chemin vers l'image de capture
+            original: Image de la capture
             title: Titre de la page (balise <title>)
             url: URL affichée dans la barre d'adresse
             style: Style de la barre ('chrome', 'safari', 'minimal')
 
         Returns:
-            Chemin vers l'image modifiée (même chemin, fichier écrasé)
+            Nouvelle image (barre de titre + capture), à enregistrer par l'appelant
         """
-        style_config = self.STYLES.get(style, self.STYLES["chrome"])
+        style_config = self._get_style(style)
+        title_font = style_config["title_font"]
+        url_font = style_config["url_font"]
 
-        # Ouvrir l'image originale
-        original = Image.open(image_path)
         original_width, original_height = original.size
 
-        # Créer une nouvelle image avec espace pour la barre de titre
+        # Une seule allocation : le fond de barre pré-rendu (identique pour un
+        # même style/largeur) est collé directement dans l'image finale, et le
+        # texte y est dessiné en place, sans copie intermédiaire de la barre
         bar_height = style_config["height"]
-        new_height = original_height + bar_height
-        new_image = Image.new(
-            "RGB", (original_width, new_height), style_config["bg_color"]
-        )
-
-        # Dessiner la barre de titre
+        new_image = Image.new("RGB", (original_width, original_height + bar_height))
+        new_image.paste(self._render_static_bar(style, original_width), (0, 0))
         draw = ImageDraw.Draw(new_image)
 
-        # Charger une police (ou utiliser la police par défaut)
-        try:
-            # Essayer différentes polices système
-            font_paths = [
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-                "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-                "/System/Library/Fonts/Helvetica.ttc",
-                "C:\\Windows\\Fonts\\segoeui.ttf",
-            ]
-            title_font = None
-            url_font = None
-            for font_path in font_paths:
-                if os.path.exists(font_path):
-                    title_font = ImageFont.truetype(font_path, 14)
-                    url_font = ImageFont.truetype(font_path, 12)
-                    break
-            if not title_font:
-                title_font = ImageFont.load_default()
-                url_font = ImageFont.load_default()
-        except:
-            title_font = ImageFont.load_default()
-            url_font = ImageFont.load_default()
-
-        # Dessiner les boutons de fenêtre (rouge, jaune, vert)
-        button_y = 14
-        button_x = 16
-        button_radius = 6
-        button_spacing = 20
-
-        for i, color in enumerate(style_config["button_colors"]):
-            x = button_x + i * button_spacing
-            draw.ellipse(
-                [
-                    x - button_radius,
-                    button_y - button_radius,
-                    x + button_radius,
-                    button_y + button_radius,
-                ],
-                fill=color,
-            )
-
         # Dessiner le titre centré
         title_bbox = draw.textbbox((0, 0), title, font=title_font)
         title_width = title_bbox[2] - title_bbox[0]
@@ -219,44 +266,63 @@ class TitleBarRenderer:
             (title_x, title_y), title, fill=style_config["title_color"], font=title_font
         )
 
-        # Dessiner la barre d'URL
-        url_bar_y = 34
+        # Texte de l'URL centré dans la barre
+        url_bar_y = style_config["url_bar_y"]
         url_bar_height = style_config["url_bar_height"]
-        url_bar_margin = 80
-        url_bar_radius = url_bar_height // 2
+        url_bbox = draw.textbbox((0, 0), url, font=url_font)
+        url_text_width = url_bbox[2] - url_bbox[0]
+        url_x = (original_width - url_text_width) // 2
+        url_y = url_bar_y + (url_bar_height - (url_bbox[3] - url_bbox[1])) // 2
+        draw.text((url_x, url_y), url, fill=style_config["url_color"], font=url_font)
+
+        # Coller la capture en dernier : elle recouvre un éventuel dépassement
+        # du champ d'URL sous la barre (styles compacts)
+        new_image.paste(original, (0, bar_height))
+
+        return new_image
+
+    def _render_static_bar(self, style: str, width: int) -> "Image.Image":
+        """
+        Retourne la partie fixe de la barre (fond, boutons, champ d'URL).
+
+        Le rendu est mis en cache par (style, largeur) : l'appelant le colle
+        dans sa propre image et ne doit jamais dessiner dessus.
+        """
+        key = (style, width)
+        if key in self._bar_template_cache:
+            return self._bar_template_cache[key]
+
+        style_config = self._get_style(style)
+        bar = Image.new(
+            "RGB", (width, style_config["height"]), style_config["bg_color"]
+        )
+        draw = ImageDraw.Draw(bar)
+
+        # Dessiner les boutons de fenêtre (rouge, jaune, vert)
+        for box, color in style_config["button_boxes"]:
+            draw.ellipse(box, fill=color)
 
         # Fond de la barre d'URL (rectangle arrondi simulé)
+        url_bar_y = style_config["url_bar_y"]
+        url_bar_margin = style_config["url_bar_margin"]
         draw.rounded_rectangle(
             [
                 url_bar_margin,
                 url_bar_y,
-                original_width - url_bar_margin,
-                url_bar_y + url_bar_height,
+                width - url_bar_margin,
+                url_bar_y + style_config["url_bar_height"],
             ],
-            radius=url_bar_radius,
+            radius=style_config["url_bar_radius"],
             fill=style_config["url_bg"],
         )
 
-        # Texte de l'URL centré dans la barre
-        url_bbox = draw.textbbox((0, 0), url, font=url_font)
-        url_text_width = url_bbox[2] - url_bbox[0]
-        url_x = (original_width - url_text_width) // 2
-        url_y = url_bar_y + (url_bar_height - (url_bbox[3] - url_bbox[1])) // 2
-        draw.text((url_x, url_y), url, fill=style_config["url_color"], font=url_font)
-
-        # Coller l'image originale en dessous de la barre
-        new_image.paste(original, (0, bar_height))
-
-        # Sauvegarder
-        new_image.save(image_path, quality=95)
-        original.close()
+        self._bar_template_cache[key] = bar
+        return bar
 
-        return image_path
-
-    def extract_page_title(self, page) -> str:
+    async def extract_page_title(self, page) -> str:
         """Extrait le titre de la page depuis Playwright"""
         try:
-            return page.title() or "Sans titre"
+            return await page.title() or "Sans titre"
         except:
             return "Sans titre"
 
@@ -268,86 +334,334 @@ class GitProjectManager:
     # Ex: [screenshot:home-page] ou [screenshot:home-page,about-page,contact-page]
     SCREENSHOT_PATTERN = re.compile(r"\[screenshot:([^\]]+)\]")
 
-    def __init__(self, project_path: str):
+    # Répertoire (dans le projet) qui accueille les worktrees de capture
+    WORKTREE_DIR = ".screenshot_worktrees"
+
+    # Fichiers non versionnés du projet principal copiés dans chaque worktree
+    # (vraies copies : via un lien symbolique, PHP résoudrait __DIR__ vers le
+    # projet principal ; via un lien physique, écrire dans le worktree
+    # modifierait les fichiers du projet)
+    SHARED_PATHS = ["vendor", "node_modules", ".env.local"]
+
+    # Fichier (dans chaque worktree) mémorisant l'état des copies de SHARED_PATHS
+    SHARED_STAMP = ".screenshot_shared.json"
+
+    # Fichiers dont la modification impose de vider le cache et redémarrer PHP
+    # (les templates Twig et les assets sont rechargés à chaud par Symfony)
+    RUNTIME_PATTERNS = ["config/*", "src/*", "composer.*", ".env*"]
+
+    def __init__(self, project_path: str, shared_paths: Optional[List[str]] = None):
         self.project_path = Path(project_path).resolve()
         if not GIT_AVAILABLE:
             raise RuntimeError("GitPython est requis")
         self.repo = git.Repo(self.project_path)
-        self.original_branch = self.repo.active_branch.name
-        self.original_commit = self.repo.head.commit.hexsha
+        self.worktree_root = self.project_path / self.WORKTREE_DIR
+        self.shared_paths = (
+            shared_paths if shared_paths is not None else self.SHARED_PATHS
+        )
+        self._commits: Optional[List[CommitScreenshots]] = None
+        # Les slots parallèles préparent leurs worktrees depuis des threads
+        self._worktree_lock = threading.Lock()
+
+        # Un seul processus `git cat-file --batch`, lancé à la demande
+        self._cat_file: Optional[subprocess.Popen] = None
 
     def get_screenshot_commits(self) -> List[CommitScreenshots]:
         """Récupère tous les commits marqués pour capture, groupés par commit"""
-        commits_with_screenshots = []
+        # L'historique n'est parcouru qu'une fois par instance : toutes les
+        # autres vues (captures à plat, total) sont dérivées de ce résultat
+        if self._commits is None:
+            commits = list(self._scan_commits())
+
+            # Inverser pour avoir l'ordre chronologique
+            commits.reverse()
+
+            # Ajouter l'index du commit (01, 02, 03, ...) à chaque CommitScreenshots
+            for index, commit_group in enumerate(commits, start=1):
+                commit_group.index = index
 
-        for commit in self.repo.iter_commits():
+            self._commits = commits
+        return self._commits
+
+    def get_all_screenshot_specs(self) -> List[ScreenshotSpec]:
+        """Récupère toutes les captures à plat (pour compatibilité)"""
+        return list(
+            itertools.chain.from_iterable(
+                cg.screenshots for cg in self.get_screenshot_commits()
+            )
+        )
+
+    def count_screenshots(self) -> int:
+        """Nombre total de captures, sans construire la liste à plat"""
+        return sum(len(cg.screenshots) for cg in self.get_screenshot_commits())
+
+    def _scan_commits(self):
+        """Parcourt l'historique (du plus récent au plus ancien) en une passe"""
+        # Filtrage fait par `git log --grep` : seuls les commits marqués sont
+        # transmis à Python (la regex sert ensuite à extraire les noms)
+        for commit in self.repo.iter_commits(
+            grep=r"\[screenshot:", extended_regexp=True
+        ):
             match = self.SCREENSHOT_PATTERN.search(commit.message)
-            if match:
-                # Extraire les noms de captures (peut être "nom1,nom2,nom3")
-                screenshot_names_str = match.group(1)
-                screenshot_names = [
-                    name.strip() for name in screenshot_names_str.split(",")
-                ]
-
-                # Créer un ScreenshotSpec pour chaque nom
-                specs = []
-                for name in screenshot_names:
-                    specs.append(
-                        ScreenshotSpec(
-                            name=name,
-                            commit_sha=commit.hexsha,
-                            commit_message=commit.message,
-                            description=commit.message.split("\n")[0],
-                        )
-                    )
+            if not match:
+                continue
 
-                commits_with_screenshots.append(
-                    CommitScreenshots(
-                        commit_sha=commit.hexsha,
-                        commit_message=commit.message,
-                        screenshots=specs,
-                        description=commit.message.split("\n")[0],
-                    )
+            # Extraire les noms de captures (peut être "nom1,nom2,nom3")
+            screenshot_names = [name.strip() for name in match.group(1).split(",")]
+            first_line = commit.message.split("\n", 1)[0]
+
+            # Créer un ScreenshotSpec pour chaque nom
+            specs = [
+                ScreenshotSpec(
+                    name=name,
+                    commit_sha=commit.hexsha,
+                    commit_message=commit.message,
+                    description=first_line,
                 )
+                for name in screenshot_names
+            ]
 
-        # Inverser pour avoir l'ordre chronologique
-        commits_with_screenshots.reverse()
+            yield CommitScreenshots(
+                commit_sha=commit.hexsha,
+                commit_message=commit.message,
+                screenshots=specs,
+                description=first_line,
+            )
 
-        # Ajouter l'index du commit (01, 02, 03, ...) à chaque CommitScreenshots
-        for index, commit_group in enumerate(commits_with_screenshots, start=1):
-            commit_group.index = index
+    def prepare_worktree(self, name: str, sha: str) -> Path:
+        """
+        Place le worktree détaché `name` sur un commit, sans toucher au projet.
 
-        return commits_with_screenshots
+        Chaque serveur d'un slot possède son worktree (`slot-0-0`, `slot-0-1`,
+        ...) : aucun autre ne peut le modifier pendant qu'il est servi.
+        Les worktrees sont conservés entre les exécutions : passer d'un
+        commit à l'autre ne met à jour que les fichiers modifiés.
+
+        Returns:
+            Chemin du worktree
+        """
+        path = self.worktree_root / name
+        current = self._worktree_head(path) if path.exists() else None
+
+        # Chaque worktree a son propre index : checkout et copies des
+        # différents worktrees peuvent avancer en parallèle
+        if current == sha:
+            print(f"  → Worktree {name} réutilisé: {sha[:8]}")
+        elif current is not None:
+            git.Git(path).checkout("--detach", "--force", sha)
+            print(f"  → Worktree {name} mis à jour: {sha[:8]}")
+        else:
+            if path.exists():
+                # Répertoire orphelin ou à moitié supprimé : ce n'est
+                # pas (ou plus) un worktree, le recréer
+                shutil.rmtree(path)
+            # Seuls l'ajout, le nettoyage et info/exclude touchent l'état
+            # partagé du dépôt
+            with self._worktree_lock:
+                self.prune_worktrees()
+                self._exclude_worktree_root()
+                self.repo.git.worktree("add", "--detach", "--force", str(path), sha)
+            print(f"  → Worktree {name} créé: {sha[:8]}")
+
+        self._copy_shared_paths(path)
+        return path
+
+    def touches_runtime_files(self, from_sha: str, to_sha: str) -> bool:
+        """Indique si un commit modifie PHP ou la configuration (RUNTIME_PATTERNS)"""
+        changed = self.repo.git.diff("--name-only", from_sha, to_sha).splitlines()
+        return any(
+            fnmatch.fnmatch(path, pattern)
+            for path in changed
+            for pattern in self.RUNTIME_PATTERNS
+        )
+
+    def prune_worktrees(self):
+        """Oublie les worktrees dont le répertoire a été supprimé"""
+        self.repo.git.worktree("prune")
+
+    def _worktree_head(self, path: Path) -> Optional[str]:
+        """
+        Retourne le commit courant d'un worktree (None s'il est invalide).
+
+        Sans fichier `.git` propre, git remonterait jusqu'au projet principal
+        et toute commande (checkout compris) s'appliquerait à celui-ci.
+        """
+        if not (path / ".git").is_file():
+            return None
+        try:
+            worktree = git.Git(path)
+            toplevel = Path(worktree.rev_parse("--show-toplevel"))
+            if toplevel.resolve() != path.resolve():
+                return None
+            return worktree.rev_parse("HEAD")
+        except git.GitCommandError:
+            return None
+
+    def _copy_shared_paths(self, worktree: Path):
+        """
+        Copie les dépendances non versionnées (vendor, ...) dans le worktree.
+
+        Ce sont de vraies copies : écrire dans un worktree (`composer install`)
+        ne modifie jamais le projet. Une copie est refaite dès que la source
+        a changé depuis (voir `_shared_signature`).
+        """
+        stamp_file = worktree / self.SHARED_STAMP
+        try:
+            stamps = json.loads(stamp_file.read_text())
+        except (OSError, ValueError):
+            stamps = {}
+
+        for name in self.shared_paths:
+            source = self.project_path / name
+            target = worktree / name
+            if not source.exists():
+                continue
+            signature = self._shared_signature(source)
+            if (
+                stamps.get(name) == signature
+                and target.exists()
+                and not target.is_symlink()
+            ):
+                continue
+
+            # Copie absente, obsolète, ou lien laissé par une version précédente
+            if target.is_symlink() or target.is_file():
+                target.unlink()
+            elif target.exists():
+                shutil.rmtree(target)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if source.is_dir():
+                shutil.copytree(source, target, symlinks=True)
+            else:
+                shutil.copy2(source, target)
+            stamps[name] = signature
+            print(f"  → {name} copié dans {worktree.name}")
+
+        stamp_file.write_text(json.dumps(stamps))
+
+    @staticmethod
+    def _shared_signature(source: Path) -> int:
+        """
+        Date de modification la plus récente de `source` et de ses entrées
+        directes : `composer install` et `npm install` réécrivent toujours
+        `vendor/autoload.php` et `node_modules/.package-lock.json`.
+        """
+        mtimes = [source.stat().st_mtime_ns]
+        if source.is_dir():
+            with os.scandir(source) as entries:
+                mtimes.extend(
+                    entry.stat(follow_symlinks=False).st_mtime_ns for entry in entries
+                )
+        return max(mtimes)
+
+    def _exclude_worktree_root(self):
+        """Empêche les worktrees d'apparaître dans `git status` du projet"""
+        exclude_file = Path(self.repo.git_dir) / "info" / "exclude"
+        entry = f"/{self.WORKTREE_DIR}/"
+        existing = exclude_file.read_text() if exclude_file.exists() else ""
+        if entry not in existing.splitlines():
+            exclude_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(exclude_file, "a", encoding="utf-8") as f:
+                if existing and not existing.endswith("\n"):
+                    f.write("\n")
+                f.write(f"{entry}\n")
+
+    def get_files_at_commit(
+        self, sha: str, paths: Optional[List[str]] = None
+    ) -> Dict[str, str]:
+        """
+        Récupère le contenu des fichiers (texte) à un commit donné.
+
+        Args:
+            sha: Commit à lire
+            paths: Fichiers à lire (par défaut: tout l'arbre du commit)
+        """
+        if paths is None:
+            return self._read_tree(sha)
 
-    def get_all_screenshot_specs(self) -> List[ScreenshotSpec]:
-        """Récupère toutes les captures à plat (pour compatibilité)"""
-        all_specs = []
-        for commit_group in self.get_screenshot_commits():
-            all_specs.extend(commit_group.screenshots)
-        return all_specs
-
-    def checkout_commit(self, sha: str):
-        """Se positionne sur un commit spécifique"""
-        self.repo.git.checkout(sha)
-        print(f"  → Checkout: {sha[:8]}")
-
-    def restore_original(self):
-        """Restaure l'état original"""
-        self.repo.git.checkout(self.original_branch)
-        print(f"✓ Restauré sur: {self.original_branch}")
-
-    def get_files_at_commit(self, sha: str) -> Dict[str, str]:
-        """Récupère le contenu des fichiers à un commit donné"""
-        commit = self.repo.commit(sha)
         files = {}
-        for blob in commit.tree.traverse():
-            if blob.type == "blob":
-                try:
-                    files[blob.path] = blob.data_stream.read().decode("utf-8")
-                except:
-                    pass
+        for path in paths:
+            try:
+                files[path] = self._read_blob(f"{sha}:{path}").decode("utf-8")
+            except (KeyError, UnicodeDecodeError):
+                pass
+        return files
+
+    def _read_tree(self, sha: str) -> Dict[str, str]:
+        """
+        Lit tout l'arbre d'un commit en un seul flux `git archive`.
+
+        Les liens symboliques sont renvoyés avec leur cible comme contenu,
+        comme le ferait `git cat-file`. Contrairement à `ls-tree`, les
+        attributs `export-ignore`/`export-subst` du dépôt sont appliqués.
+        """
+        files = {}
+        proc = subprocess.Popen(
+            ["git", "archive", "--format=tar", sha],
+            cwd=self.project_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        read_error = None
+        try:
+            with tarfile.open(fileobj=proc.stdout, mode="r|") as tar:
+                for member in tar:
+                    if member.issym():
+                        files[member.name] = member.linkname
+                        continue
+                    if not member.isfile():
+                        continue
+                    try:
+                        files[member.name] = (
+                            tar.extractfile(member).read().decode("utf-8")
+                        )
+                    except UnicodeDecodeError:
+                        pass
+        except tarfile.ReadError as e:
+            # Flux vide ou tronqué : la vraie cause est sur stderr
+            read_error = e
+        finally:
+            proc.stdout.close()
+            stderr = proc.stderr.read().decode(errors="replace").strip()
+            proc.stderr.close()
+            proc.wait()
+
+        if proc.returncode != 0:
+            raise RuntimeError(f"git archive {sha} a échoué: {stderr}")
+        if read_error:
+            raise read_error
         return files
 
+    def _read_blob(self, object_name: str) -> bytes:
+        """Lit un blob (sha ou "<commit>:<chemin>") via `git cat-file --batch`"""
+        if self._cat_file is None:
+            # Démarré à la première lecture seulement
+            self._cat_file = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                cwd=self.project_path,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+        self._cat_file.stdin.write(f"{object_name}\n".encode())
+        self._cat_file.stdin.flush()
+
+        # Réponse: "<sha> <type> <taille>\n<contenu>\n" ou "<nom> missing\n"
+        header = self._cat_file.stdout.readline().split()
+        if not header or header[-1] in (b"missing", b"ambiguous"):
+            raise KeyError(f"Objet introuvable: {object_name}")
+        data = self._cat_file.stdout.read(int(header[2]))
+        self._cat_file.stdout.read(1)
+        if header[1] != b"blob":
+            raise KeyError(f"Pas un fichier: {object_name}")
+        return data
+
+    def close(self):
+        """Arrête le processus `git cat-file --batch`"""
+        if self._cat_file:
+            self._cat_file.stdin.close()
+            self._cat_file.wait()
+            self._cat_file = None
+
 
 class SymfonyServer:
     """Gère le serveur de développement Symfony"""
@@ -359,7 +673,7 @@ class SymfonyServer:
         self.base_url = f"http://127.0.0.1:{port}"
 
     def start(self):
-        """Démarre le serveur"""
+        """Démarre le serveur (sans attendre, voir wait_until_ready)"""
         if self.process:
             return
 
@@ -369,9 +683,47 @@ class SymfonyServer:
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
         )
-        time.sleep(2)
         print(f"✓ Serveur démarré sur {self.base_url}")
 
+    def is_running(self) -> bool:
+        """Indique si le processus du serveur est démarré et toujours vivant"""
+        return self.process is not None and self.process.poll() is None
+
+    def wait_until_ready(self, timeout: float = 10.0) -> bool:
+        """
+        Attend que le serveur réponde, au lieu d'un délai fixe.
+
+        Sonde d'abord le port TCP toutes les 20 ms, puis confirme par une
+        requête HTTP que PHP répond (et pas seulement le socket).
+
+        Returns:
+            True si le serveur est prêt avant l'expiration du délai
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            if not self.is_running():
+                return False
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=0.1):
+                    break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(0.02)
+
+        # La première requête peut être lente (construction du cache Symfony)
+        remaining = max(1.0, deadline - time.monotonic())
+        # Sans proxy: un HTTP_PROXY d'environnement ne doit pas intercepter 127.0.0.1
+        opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+        try:
+            with opener.open(f"{self.base_url}/", timeout=remaining):
+                return True
+        except urllib.error.HTTPError:
+            # Une page d'erreur (404, 500, ...) prouve que PHP répond
+            return True
+        except OSError:
+            return False
+
     def stop(self):
         """Arrête le serveur"""
         if self.process:
@@ -382,17 +734,37 @@ class SymfonyServer:
 
     def restart(self):
         """Redémarre le serveur (utile après un changement de code)"""
+        # stop() attend la fin du processus : le port est libéré
         self.stop()
-        time.sleep(1)
         self.start()
 
     def clear_cache(self):
-        """Vide le cache Symfony"""
+        """
+        Vide le cache Symfony.
+
+        Le répertoire est d'abord renommé (instantané) puis supprimé dans un
+        thread en arrière-plan : le serveur repart aussitôt sur un cache vide.
+        """
         cache_dir = self.project_path / "var" / "cache"
         if cache_dir.exists():
-            shutil.rmtree(cache_dir)
+            cache_dir.rename(
+                cache_dir.with_name(f"cache.deleting.{os.getpid()}.{time.time_ns()}")
+            )
             print("  → Cache vidé")
 
+        # Inclut les restes d'une exécution interrompue avant la fin du thread
+        trash_dirs = list(cache_dir.parent.glob("cache.deleting.*"))
+        if trash_dirs:
+            threading.Thread(
+                target=self._remove_dirs, args=(trash_dirs,), daemon=True
+            ).start()
+
+    @staticmethod
+    def _remove_dirs(paths: List[Path]):
+        """Supprime des répertoires (exécuté en arrière-plan)"""
+        for path in paths:
+            shutil.rmtree(path, ignore_errors=True)
+
 
 class BrowserCapture:
     """Capture les pages web avec Playwright"""
@@ -402,94 +774,250 @@ class BrowserCapture:
             raise RuntimeError("Playwright est requis")
         self.playwright = None
         self.browser = None
-        self.context = None
-
-    def start(self, headless: bool = True):
+        self._postprocess_pool = None
+        self.postprocess_futures: List[concurrent.futures.Future] = []
+        # Pages prêtes à être réutilisées, par device_scale_factor
+        self._page_pools: Dict[float, asyncio.Queue] = {}
+        # Filtre de la capture en cours sur chaque page :
+        # (origine autorisée ou None, types de ressources bloqués)
+        self._page_filters: Dict[object, Tuple[Optional[str], List[str]]] = {}
+        # Pages dont les requêtes passent par _filter_request
+        self._routed_pages: Set[object] = set()
+
+    async def start(self, headless: bool = True):
         """Démarre le navigateur"""
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=headless)
-        self.context = self.browser.new_context(
-            viewport={"width": 1280, "height": 800},
-            device_scale_factor=2,  # Qualité retina
-        )
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(headless=headless)
         self.title_bar_renderer = TitleBarRenderer() if PIL_AVAILABLE else None
+        # Le travail Pillow (décodage, dessin, encodage) se fait hors de la
+        # boucle asyncio, pendant que les captures suivantes continuent
+        self._postprocess_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
         print("✓ Navigateur démarré")
 
-    def capture(self, spec: ScreenshotSpec, base_url: str) -> str:
-        """Prend une capture d'écran"""
-        page = self.context.new_page()
-        page.set_viewport_size(
-            {"width": spec.viewport_width, "height": spec.viewport_height}
-        )
+    async def capture(self, spec: ScreenshotSpec, base_url: str) -> str:
+        """
+        Prend une capture d'écran.
 
+        La page est empruntée à un pool puis y est remise, sans être fermée.
+        Chaque page a son propre BrowserContext : plusieurs captures peuvent
+        donc être lancées en parallèle sans partager cookies ni stockage.
+        """
         url = spec.url if spec.url.startswith("http") else f"{base_url}{spec.url}"
+        allowed_origin = self._origin(url) if spec.block_third_party else None
 
+        page = await self._acquire_page(spec.device_scale_factor)
         try:
-            page.goto(url, wait_until="networkidle", timeout=10000)
-        except Exception as e:
-            if spec.is_error_page:
-                # C'est normal pour les pages d'erreur
-                pass
-            else:
-                print(f"  ⚠️ Erreur de chargement: {e}")
+            await self._set_page_filter(page, allowed_origin, spec.blocked_resources)
+            await page.set_viewport_size(
+                {"width": spec.viewport_width, "height": spec.viewport_height}
+            )
 
-        if spec.wait_for:
             try:
-                page.wait_for_selector(spec.wait_for, timeout=5000)
-            except:
-                pass
+                await page.goto(url, wait_until=spec.wait_until, timeout=10000)
+            except Exception as e:
+                if spec.is_error_page:
+                    # C'est normal pour les pages d'erreur
+                    pass
+                else:
+                    print(f"  ⚠️ Erreur de chargement: {e}")
 
-        time.sleep(spec.delay)
+            if spec.wait_for:
+                try:
+                    await page.wait_for_selector(spec.wait_for, timeout=5000)
+                except:
+                    pass
 
-        # Récupérer le titre de la page AVANT de fermer
-        page_title = page.title() or "Sans titre"
+            await asyncio.sleep(spec.delay)
 
-        output_path = Path(spec.output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+            # Récupérer le titre de la page AVANT de fermer
+            page_title = await page.title() or "Sans titre"
 
-        page.screenshot(path=str(output_path), full_page=spec.full_page)
+            output_path = Path(spec.output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        page.close()
+            # Garder les octets en mémoire : une seule écriture disque au total
+            if spec.format == "jpeg":
+                image_bytes = await page.screenshot(
+                    full_page=spec.full_page, type="jpeg", quality=spec.quality
+                )
+            else:
+                image_bytes = await page.screenshot(full_page=spec.full_page)
+        except BaseException:
+            # Page dans un état inconnu : ne pas la remettre dans le pool
+            await self._discard_page(page)
+            raise
 
-        # Ajouter la barre de titre si demandé
-        if spec.show_title_bar:
-            if self.title_bar_renderer:
-                try:
-                    self.title_bar_renderer.add_title_bar(
-                        image_path=str(output_path),
-                        title=page_title,
-                        url=url,
-                        style=spec.title_bar_style,
-                    )
-                    print(
-                        f"    🏷️  Barre de titre ajoutée (style: {spec.title_bar_style})"
+        try:
+            # Ajouter la barre de titre si demandé
+            if spec.show_title_bar and self.title_bar_renderer:
+                self.postprocess_futures.append(
+                    self._postprocess_pool.submit(
+                        self._add_title_bar,
+                        spec,
+                        output_path,
+                        image_bytes,
+                        page_title,
+                        url,
                     )
-                except Exception as e:
-                    print(f"    ⚠️ Erreur lors de l'ajout de la barre de titre: {e}")
+                )
             else:
-                print("    ⚠️ Barre de titre demandée mais Pillow non disponible")
+                if spec.show_title_bar:
+                    print("    ⚠️ Barre de titre demandée mais Pillow non disponible")
+                output_path.write_bytes(image_bytes)
+        finally:
+            # Libérer la page seulement une fois l'image en sécurité : un échec
+            # du nettoyage ne doit ni perdre la capture ni fuir le contexte
+            try:
+                await self._release_page(page, spec.device_scale_factor)
+            except Exception:
+                await self._discard_page(page)
 
         return str(output_path)
 
-    def stop(self):
+    def _add_title_bar(
+        self,
+        spec: ScreenshotSpec,
+        output_path: Path,
+        image_bytes: bytes,
+        title: str,
+        url: str,
+    ):
+        """Ajoute la barre de titre et enregistre (pool de post-traitement)"""
+        try:
+            with Image.open(io.BytesIO(image_bytes)) as original:
+                image = self.title_bar_renderer.add_title_bar(
+                    original, title=title, url=url, style=spec.title_bar_style
+                )
+
+            # Un niveau zlib bas encode bien plus vite que le défaut (6)
+            if spec.format == "jpeg":
+                image.save(output_path, format="JPEG", quality=spec.quality)
+            else:
+                image.save(output_path, format="PNG", compress_level=spec.compression)
+            print(f"    🏷️  Barre de titre ajoutée (style: {spec.title_bar_style})")
+        except Exception as e:
+            print(f"    ⚠️ Erreur lors de l'ajout de la barre de titre: {e}")
+            # Conserver au moins la capture brute
+            output_path.write_bytes(image_bytes)
+
+    def wait_postprocess(self):
+        """Attend la fin des barres de titre en cours d'ajout"""
+        concurrent.futures.wait(self.postprocess_futures)
+        self.postprocess_futures.clear()
+
+    async def _acquire_page(self, device_scale_factor: float):
+        """Retourne une page libre du pool, ou en crée une (avec son contexte)"""
+        pool = self._page_pools.setdefault(device_scale_factor, asyncio.Queue())
+        if not pool.empty():
+            return pool.get_nowait()
+
+        context = await self.browser.new_context(
+            device_scale_factor=device_scale_factor
+        )
+        return await context.new_page()
+
+    async def _set_page_filter(
+        self, page, allowed_origin: Optional[str], blocked_resources: List[str]
+    ):
+        """
+        Applique le filtre de la capture à la page. L'interception n'est
+        installée que si un filtre est actif : sinon chaque requête ferait
+        un aller-retour inutile vers Python.
+        """
+        self._page_filters[page] = (allowed_origin, blocked_resources)
+        filtering = bool(allowed_origin or blocked_resources)
+        if filtering and page not in self._routed_pages:
+            await page.route("**/*", lambda route: self._filter_request(route, page))
+            self._routed_pages.add(page)
+        elif not filtering and page in self._routed_pages:
+            await page.unroute("**/*")
+            self._routed_pages.discard(page)
+
+    async def _release_page(self, page, device_scale_factor: float):
+        """Remet une page dans le pool, après avoir effacé son état"""
+        try:
+            await page.evaluate(
+                "() => { localStorage.clear(); sessionStorage.clear(); }"
+            )
+        except Exception:
+            # Stockage inaccessible (page d'erreur, about:blank, ...)
+            pass
+        await page.context.clear_cookies()
+        # Quitter la page : ses timers et requêtes en cours ne doivent pas
+        # tourner pendant qu'elle attend dans le pool
+        await page.goto("about:blank")
+        self._page_filters.pop(page, None)
+        self._page_pools[device_scale_factor].put_nowait(page)
+
+    async def _discard_page(self, page):
+        """Ferme une page (et son contexte) au lieu de la remettre dans le pool"""
+        self._page_filters.pop(page, None)
+        self._routed_pages.discard(page)
+        await page.context.close()
+
+    async def _filter_request(self, route, page):
+        """
+        Bloque les ressources lourdes (vidéos, polices, ...) et les requêtes
+        tierces (CDN, analytics) : elles échouent immédiatement au lieu de
+        ralentir le chargement de la page.
+        """
+        allowed_origin, blocked_resources = self._page_filters.get(page, (None, []))
+        request = route.request
+        if request.resource_type in blocked_resources or (
+            allowed_origin and self._origin(request.url) != allowed_origin
+        ):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        """Retourne l'origine (schéma + hôte + port) d'une URL"""
+        parts = urllib.parse.urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    async def stop(self):
         """Ferme le navigateur"""
-        if self.context:
-            self.context.close()
+        if self._postprocess_pool:
+            self._postprocess_pool.shutdown(wait=True)
+            self._postprocess_pool = None
+        for pool in self._page_pools.values():
+            while not pool.empty():
+                await pool.get_nowait().context.close()
+        self._page_pools.clear()
+        self._routed_pages.clear()
         if self.browser:
-            self.browser.close()
+            await self.browser.close()
         if self.playwright:
-            self.playwright.stop()
+            await self.playwright.stop()
 
 
 class ScreenshotOrchestrator:
     """Orchestre la génération de toutes les captures"""
 
+    # Formats de sortie acceptés dans la config (et leurs alias)
+    OUTPUT_FORMATS = {"png": "png", "jpeg": "jpeg", "jpg": "jpeg"}
+
+    # Nombre maximal de commits traités en parallèle (un slot chacun :
+    # worktrees + serveurs PHP sur leurs propres ports + contextes navigateur)
+    MAX_PARALLEL_COMMITS = 4
+    BASE_PORT = 8000
+
+    # Serveurs par slot : pendant que le commit N est capturé sur l'un,
+    # le commit N+1 est déjà extrait et servi par l'autre
+    SERVERS_PER_SLOT = 2
+
+    # Délai maximal d'attente du serveur PHP après son démarrage (secondes)
+    SERVER_READY_TIMEOUT = 10.0
+
     def __init__(self, project_path: str, config_path: Optional[str] = None):
         self.project_path = Path(project_path).resolve()
         self.config = self._load_config(config_path) if config_path else {}
 
-        self.git_manager = GitProjectManager(project_path)
-        self.server = SymfonyServer(project_path)
+        self.git_manager = GitProjectManager(
+            project_path, shared_paths=self.config.get("shared_paths")
+        )
+        self.servers: List[SymfonyServer] = []
         self.browser = BrowserCapture()
 
         self.results = []
@@ -499,19 +1027,43 @@ class ScreenshotOrchestrator:
         with open(path, "r", encoding="utf-8") as f:
             return yaml.safe_load(f)
 
-    def setup(self, headless: bool = True):
+    async def setup(self, headless: bool = True):
         """Initialise tous les composants"""
-        self.browser.start(headless=headless)
-        self.server.start()
+        await self.browser.start(headless=headless)
 
-    def teardown(self):
+    async def teardown(self):
         """Nettoie les ressources"""
-        self.browser.stop()
-        self.server.stop()
-        self.git_manager.restore_original()
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.browser.wait_postprocess
+        )
+        await self.browser.stop()
+        for server in self.servers:
+            server.stop()
+        self.git_manager.prune_worktrees()
+        self.git_manager.close()
+
+    async def run(
+        self, only: List[str] = None, headless: bool = True, jobs: int = None
+    ):
+        """Initialise, exécute les captures puis nettoie les ressources"""
+        try:
+            await self.setup(headless=headless)
+            await self.run_from_git(only, jobs=jobs)
+        finally:
+            await self.teardown()
 
-    def run_from_git(self, only: List[str] = None):
-        """Exécute les captures basées sur les commits Git"""
+    async def run_from_git(self, only: List[str] = None, jobs: int = None):
+        """
+        Exécute les captures basées sur les commits Git.
+
+        Les commits sont répartis entre plusieurs slots indépendants (un
+        worktree et un serveur PHP chacun) qui travaillent en parallèle.
+
+        Args:
+            only: Ne capturer que ces noms de captures
+            jobs: Nombre de commits traités en parallèle
+                  (par défaut: MAX_PARALLEL_COMMITS)
+        """
         commit_groups = self.git_manager.get_screenshot_commits()
 
         if not commit_groups:
@@ -524,98 +1076,249 @@ class ScreenshotOrchestrator:
             )
             return
 
+        # Valider les formats avant toute capture : les noms de fichiers
+        # (y compris ceux des captures en erreur) en dépendent
+        for commit_group in commit_groups:
+            for spec in commit_group.screenshots:
+                self.resolve_output_format(spec)
+
         # Compter le total de captures
-        total_screenshots = sum(len(cg.screenshots) for cg in commit_groups)
+        total_screenshots = self.git_manager.count_screenshots()
         print(
             f"\n📸 {total_screenshots} captures à faire ({len(commit_groups)} commits)\n"
         )
 
-        screenshot_index = 0
+        pending = asyncio.Queue()
         for commit_group in commit_groups:
             # Filtrer les captures si --only est spécifié
             screenshots_to_take = commit_group.screenshots
             if only:
                 screenshots_to_take = [s for s in screenshots_to_take if s.name in only]
 
-            if not screenshots_to_take:
-                continue
+            if screenshots_to_take:
+                pending.put_nowait((commit_group, screenshots_to_take))
 
-            # Préfixe basé sur l'index du commit (01_, 02_, etc.)
-            commit_prefix = f"{commit_group.index:02d}_"
+        if pending.empty():
+            return
 
-            # Checkout le commit une seule fois pour toutes les captures de ce commit
-            print(f"\n{'=' * 60}")
-            print(
-                f"[{commit_prefix[:-1]}] Commit: {commit_group.commit_sha[:8]} - {commit_group.description[:40]}"
+        # SERVERS_PER_SLOT serveurs PHP (ports distincts) par slot
+        slots = max(1, min(jobs or self.MAX_PARALLEL_COMMITS, pending.qsize()))
+        per_slot = self.SERVERS_PER_SLOT
+        self.servers = [
+            SymfonyServer(self.project_path, port=self.BASE_PORT + i)
+            for i in range(slots * per_slot)
+        ]
+
+        self._screenshot_index = 0
+        await asyncio.gather(
+            *[
+                self._slot_worker(
+                    slot,
+                    self.servers[slot * per_slot : (slot + 1) * per_slot],
+                    pending,
+                    total_screenshots,
+                )
+                for slot in range(slots)
+            ]
+        )
+
+        # Les slots terminent dans le désordre : rétablir l'ordre des commits
+        self.results.sort(key=lambda r: r["commit_index"])
+
+    async def _slot_worker(
+        self,
+        slot: int,
+        servers: List[SymfonyServer],
+        pending: asyncio.Queue,
+        total_screenshots: int,
+    ):
+        """
+        Traite les commits en attente, un à la fois, sur les serveurs du slot.
+
+        Les serveurs servent les commits à tour de rôle : le commit suivant
+        est préparé sur le serveur libre pendant la capture du commit courant.
+        """
+        worktrees = [f"slot-{slot}-{i}" for i in range(len(servers))]
+        served_shas: List[Optional[str]] = [None] * len(servers)
+        current = 0
+
+        job = None if pending.empty() else pending.get_nowait()
+        serving = (
+            asyncio.ensure_future(
+                self._serve_commit(servers[0], worktrees[0], job[0], None)
             )
-            print(f"Captures: {', '.join(s.name for s in screenshots_to_take)}")
-            print(f"{'=' * 60}")
+            if job
+            else None
+        )
+        while job:
+            commit_group, screenshots_to_take = job
+            error = await serving
+            # En cas d'erreur, l'état du serveur est inconnu : repartir de zéro
+            served_shas[current] = None if error else commit_group.commit_sha
+
+            # Préparer le commit suivant pendant les captures de celui-ci
+            following = (current + 1) % len(servers)
+            job = None if pending.empty() else pending.get_nowait()
+            if job:
+                serving = asyncio.ensure_future(
+                    self._serve_commit(
+                        servers[following],
+                        worktrees[following],
+                        job[0],
+                        served_shas[following],
+                    )
+                )
 
-            try:
-                self.git_manager.checkout_commit(commit_group.commit_sha)
+            await self._capture_commit(
+                commit_group,
+                screenshots_to_take,
+                servers[current],
+                error,
+                total_screenshots,
+            )
+            current = following
+
+    async def _serve_commit(
+        self,
+        server: SymfonyServer,
+        worktree: str,
+        commit_group: CommitScreenshots,
+        served_sha: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Place le worktree du slot sur le commit et le sert.
 
-                # Vider le cache et redémarrer le serveur une seule fois par commit
-                self.server.clear_cache()
-                self.server.restart()
+        Si le serveur sert déjà `served_sha` et que le commit ne modifie ni PHP
+        ni configuration, le worktree est mis à jour sous le serveur en cours :
+        pas de cache vidé, pas de redémarrage (sauf `force_restart: true`).
 
-                # Prendre chaque capture pour ce commit
-                for spec in screenshots_to_take:
-                    screenshot_index += 1
-                    print(f"\n  [{screenshot_index}/{total_screenshots}] {spec.name}")
+        Returns:
+            Message d'erreur, ou None si le serveur est prêt
+        """
+        loop = asyncio.get_running_loop()
+        sha = commit_group.commit_sha
+        try:
+            if (
+                served_sha
+                # Un serveur mort sur le commit précédent doit être relancé
+                and server.is_running()
+                and not self.config.get("force_restart", False)
+                and not await loop.run_in_executor(
+                    None, self.git_manager.touches_runtime_files, served_sha, sha
+                )
+            ):
+                await loop.run_in_executor(
+                    None, self.git_manager.prepare_worktree, worktree, sha
+                )
+                print("  → Serveur conservé (ni PHP ni configuration modifiés)")
+                return None
 
-                    try:
-                        # Appliquer la config spécifique si elle existe
-                        self._apply_screenshot_config(spec)
+            server.project_path = await loop.run_in_executor(
+                None, self.git_manager.prepare_worktree, worktree, sha
+            )
 
-                        # Générer le chemin de sortie avec préfixe
-                        spec.output_path = self._generate_output_path(
-                            spec, commit_prefix
-                        )
+            # Vider le cache et redémarrer le serveur une seule fois par commit
+            await loop.run_in_executor(None, server.clear_cache)
+            await loop.run_in_executor(None, server.restart)
+        except Exception as e:
+            return f"Checkout failed: {e}"
+
+        if not await loop.run_in_executor(
+            None, server.wait_until_ready, self.SERVER_READY_TIMEOUT
+        ):
+            return f"Server not ready on {server.base_url}"
+        return None
+
+    async def _capture_commit(
+        self,
+        commit_group: CommitScreenshots,
+        screenshots_to_take: List[ScreenshotSpec],
+        server: SymfonyServer,
+        error: Optional[str],
+        total_screenshots: int,
+    ):
+        """Prend toutes les captures d'un commit déjà servi par `server`"""
+        # Préfixe basé sur l'index du commit (01_, 02_, etc.)
+        commit_prefix = f"{commit_group.index:02d}_"
+
+        print(f"\n{'=' * 60}")
+        print(
+            f"[{commit_prefix[:-1]}] Commit: {commit_group.commit_sha[:8]} - {commit_group.description[:40]}"
+        )
+        print(f"Captures: {', '.join(s.name for s in screenshots_to_take)}")
+        print(f"{'=' * 60}")
+
+        if error:
+            print(f"  ✗ Erreur lors du checkout: {error}")
+            # Marquer toutes les captures de ce commit comme échouées
+            for spec in screenshots_to_take:
+                self.results.append(
+                    {
+                        "name": spec.name,
+                        "filename": f"{commit_prefix}{spec.name}{spec.extension}",
+                        "path": None,
+                        "commit": commit_group.commit_sha[:8],
+                        "commit_index": commit_group.index,
+                        "status": "error",
+                        "error": error,
+                    }
+                )
+            return
 
-                        # Prendre la capture
-                        path = self.browser.capture(spec, self.server.base_url)
-
-                        self.results.append(
-                            {
-                                "name": spec.name,
-                                "filename": f"{commit_prefix}{spec.name}.png",
-                                "path": path,
-                                "commit": commit_group.commit_sha[:8],
-                                "commit_index": commit_group.index,
-                                "status": "success",
-                            }
-                        )
-                        print(f"    ✓ Sauvegardé: {path}")
-
-                    except Exception as e:
-                        self.results.append(
-                            {
-                                "name": spec.name,
-                                "filename": f"{commit_prefix}{spec.name}.png",
-                                "path": None,
-                                "commit": commit_group.commit_sha[:8],
-                                "commit_index": commit_group.index,
-                                "status": "error",
-                                "error": str(e),
-                            }
-                        )
-                        print(f"    ✗ Erreur: {e}")
+        # Prendre toutes les captures de ce commit en parallèle
+        results = await asyncio.gather(
+            *[
+                self._capture_one(
+                    commit_group, commit_prefix, spec, server, total_screenshots
+                )
+                for spec in screenshots_to_take
+            ]
+        )
+        self.results.extend(results)
+
+    async def _capture_one(
+        self,
+        commit_group: CommitScreenshots,
+        commit_prefix: str,
+        spec: ScreenshotSpec,
+        server: SymfonyServer,
+        total_screenshots: int,
+    ) -> dict:
+        """Prend une capture et retourne son résultat"""
+        self._screenshot_index += 1
+        print(f"\n  [{self._screenshot_index}/{total_screenshots}] {spec.name}")
 
-            except Exception as e:
-                print(f"  ✗ Erreur lors du checkout: {e}")
-                # Marquer toutes les captures de ce commit comme échouées
-                for spec in screenshots_to_take:
-                    self.results.append(
-                        {
-                            "name": spec.name,
-                            "filename": f"{commit_prefix}{spec.name}.png",
-                            "path": None,
-                            "commit": commit_group.commit_sha[:8],
-                            "commit_index": commit_group.index,
-                            "status": "error",
-                            "error": f"Checkout failed: {e}",
-                        }
-                    )
+        try:
+            # Appliquer la config spécifique si elle existe
+            self._apply_screenshot_config(spec)
+
+            # Générer le chemin de sortie avec préfixe
+            spec.output_path = self._generate_output_path(spec, commit_prefix)
+
+            # Prendre la capture
+            path = await self.browser.capture(spec, server.base_url)
+
+            print(f"    ✓ Sauvegardé: {path}")
+            return {
+                "name": spec.name,
+                "filename": f"{commit_prefix}{spec.name}{spec.extension}",
+                "path": path,
+                "commit": commit_group.commit_sha[:8],
+                "commit_index": commit_group.index,
+                "status": "success",
+            }
+
+        except Exception as e:
+            print(f"    ✗ Erreur: {e}")
+            return {
+                "name": spec.name,
+                "filename": f"{commit_prefix}{spec.name}{spec.extension}",
+                "path": None,
+                "commit": commit_group.commit_sha[:8],
+                "commit_index": commit_group.index,
+                "status": "error",
+                "error": str(e),
+            }
 
     def _generate_output_path(self, spec: ScreenshotSpec, commit_prefix: str) -> str:
         """Génère le chemin de sortie avec le préfixe du commit"""
@@ -632,7 +1335,28 @@ class ScreenshotOrchestrator:
                 return str(path.parent / new_filename)
 
         # Sinon, utiliser le répertoire par défaut
-        return f"{output_dir}/{commit_prefix}{spec.name}.png"
+        return f"{output_dir}/{commit_prefix}{spec.name}{spec.extension}"
+
+    def resolve_output_format(self, spec: ScreenshotSpec):
+        """
+        Fixe le format de sortie d'une capture (défauts, puis config de la
+        capture).
+
+        Raises:
+            ValueError: Si le format configuré n'est pas supporté
+        """
+        fmt = spec.format
+        for cfg in (
+            self.config.get("defaults", {}),
+            self.config.get("screenshots", {}).get(spec.name, {}),
+        ):
+            fmt = cfg.get("format", fmt)
+
+        if str(fmt).lower() not in self.OUTPUT_FORMATS:
+            raise ValueError(
+                f"Format non supporté pour '{spec.name}': {fmt} (png ou jpeg)"
+            )
+        spec.format = self.OUTPUT_FORMATS[str(fmt).lower()]
 
     def _apply_screenshot_config(self, spec: ScreenshotSpec):
         """Applique la configuration spécifique à une capture"""
@@ -642,6 +1366,19 @@ class ScreenshotOrchestrator:
             spec.show_title_bar = global_config["show_title_bar"]
         if "title_bar_style" in global_config:
             spec.title_bar_style = global_config["title_bar_style"]
+        if "device_scale_factor" in global_config:
+            spec.device_scale_factor = global_config["device_scale_factor"]
+        if "wait_until" in global_config:
+            spec.wait_until = global_config["wait_until"]
+        if "blocked_resources" in global_config:
+            spec.blocked_resources = global_config["blocked_resources"]
+        if "block_third_party" in global_config:
+            spec.block_third_party = global_config["block_third_party"]
+        if "compression" in global_config:
+            spec.compression = global_config["compression"]
+        if "quality" in global_config:
+            spec.quality = global_config["quality"]
+        self.resolve_output_format(spec)
 
         # Ensuite, appliquer la config spécifique à cette capture (qui peut override)
         screenshots_config = self.config.get("screenshots", {})
@@ -653,10 +1390,22 @@ class ScreenshotOrchestrator:
                 spec.viewport_width = cfg["viewport_width"]
             if "viewport_height" in cfg:
                 spec.viewport_height = cfg["viewport_height"]
+            if "device_scale_factor" in cfg:
+                spec.device_scale_factor = cfg["device_scale_factor"]
             if "full_page" in cfg:
                 spec.full_page = cfg["full_page"]
             if "wait_for" in cfg:
                 spec.wait_for = cfg["wait_for"]
+            if "wait_until" in cfg:
+                spec.wait_until = cfg["wait_until"]
+            if "blocked_resources" in cfg:
+                spec.blocked_resources = cfg["blocked_resources"]
+            if "block_third_party" in cfg:
+                spec.block_third_party = cfg["block_third_party"]
+            if "compression" in cfg:
+                spec.compression = cfg["compression"]
+            if "quality" in cfg:
+                spec.quality = cfg["quality"]
             if "delay" in cfg:
                 spec.delay = cfg["delay"]
             if "output" in cfg:
@@ -674,10 +1423,16 @@ class ScreenshotOrchestrator:
 
     def _apply_required_files(self, files: List[dict]):
         """Applique les fichiers requis pour une capture"""
-        for file_spec in files:
-            path = self.project_path / file_spec["path"]
-            path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(file_spec["content"], encoding="utf-8")
+        targets = [(self.project_path / spec["path"], spec) for spec in files]
+
+        # Créer chaque répertoire parent une seule fois
+        for parent in {path.parent for path, _ in targets}:
+            parent.mkdir(parents=True, exist_ok=True)
+
+        for path, file_spec in targets:
+            # Mode binaire : un seul write, sans traduction des fins de ligne
+            with open(path, "wb") as f:
+                f.write(file_spec["content"].encode("utf-8"))
             print(f"  → Fichier créé: {file_spec['path']}")
 
     def generate_report(self) -> str:
@@ -719,6 +1474,12 @@ def main():
     parser.add_argument(
         "--list", action="store_true", help="Lister les captures disponibles"
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help=f"Nombre de commits traités en parallèle (défaut: {ScreenshotOrchestrator.MAX_PARALLEL_COMMITS})",
+    )
     parser.add_argument(
         "--no-headless",
         action="store_true",
@@ -733,30 +1494,31 @@ def main():
 
     orchestrator = ScreenshotOrchestrator(args.project_path, args.config)
 
-    if args.list:
-        commit_groups = orchestrator.git_manager.get_screenshot_commits()
-        total = sum(len(cg.screenshots) for cg in commit_groups)
-        print(
-            f"Captures disponibles ({total} captures dans {len(commit_groups)} commits):\n"
-        )
-        for cg in commit_groups:
-            prefix = f"{cg.index:02d}_"
+    try:
+        if args.list:
+            commit_groups = orchestrator.git_manager.get_screenshot_commits()
+            total = orchestrator.git_manager.count_screenshots()
             print(
-                f"  [{prefix[:-1]}] Commit {cg.commit_sha[:8]}: {cg.description[:45]}"
+                f"Captures disponibles ({total} captures dans {len(commit_groups)} commits):\n"
             )
-            for spec in cg.screenshots:
-                print(f"       → {prefix}{spec.name}.png")
-        sys.exit(0)
-
-    try:
-        orchestrator.setup(headless=not args.no_headless)
-
-        orchestrator.run_from_git(args.only)
+            for cg in commit_groups:
+                prefix = f"{cg.index:02d}_"
+                print(
+                    f"  [{prefix[:-1]}] Commit {cg.commit_sha[:8]}: {cg.description[:45]}"
+                )
+                for spec in cg.screenshots:
+                    orchestrator.resolve_output_format(spec)
+                    print(f"       → {prefix}{spec.name}{spec.extension}")
+            sys.exit(0)
 
-        print("\n" + orchestrator.generate_report())
+        asyncio.run(
+            orchestrator.run(args.only, headless=not args.no_headless, jobs=args.jobs)
+        )
+    except ValueError as e:
+        print(f"Erreur: {e}")
+        sys.exit(1)
 
-    finally:
-        orchestrator.teardown()
+    print("\n" + orchestrator.generate_report())
 
 
 if __name__ == "__main__":